@@ -5,9 +5,7 @@ SELECT*FROM FOOD;
 SELECT*FROM CLAIMS;
 
 -- datatype conversion
-ALTER TABLE FOOD
-ALTER COLUMN EXPIRY_DATE TYPE DATE
-USING TO_DATE(EXPIRY_DATE,'MM/DD/YYYY');
+-- EXPIRY_DATE is converted to DATE by migration 2 in migrations.py (run: python migrations.py migrate)
 
 -- FOOD PROVIDERS AND RECEIVERS
 --- 1.How many food providers and receivers are there in each city?
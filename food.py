@@ -8,6 +8,11 @@ import psycopg2 # Used for the general connection errors
 from database import connect_db, execute_query, add_provider, \
                          get_all_food_listings, update_claim_status, delete_food_listing
                       # Include this for initial setup, but run once
+# Read queries are shared with the index advisor in migrations.py
+from queries import CITIES_QUERY, PROVIDERS_WITH_LISTINGS_QUERY, PROVIDER_TYPES_QUERY, RECEIVER_TYPES_QUERY, \
+                    FOOD_TYPES_QUERY, MEAL_TYPES_QUERY, build_filter_query, TOTAL_FOOD_AVAILABLE_QUERY, \
+                    TOTAL_CLAIMS_QUERY, TOTAL_PROVIDERS_QUERY, MOST_CLAIMED_MEALTYPE_QUERY, CITY_HIGHEST_FOOD_QUERY, \
+                    PROVIDER_CONTRIBUTION_QUERY, CLAIM_STATUS_QUERY, DATE_TREND_QUERY, ANALYSIS_QUERIES
 
 # --- Configuration ---
 st.set_page_config(
@@ -40,19 +45,12 @@ with tab1:
 # Fetch unique values for filter dropdowns (these can also be cached)
     @st.cache_data
     def get_filter_options():
-        cities = get_data_for_display("SELECT DISTINCT City FROM providers ORDER BY City;").iloc[:, 0].tolist()
-        # For provider names, join providers and food_listings to get only providers with listings
-        providers_with_listings_query = """
-        SELECT DISTINCT p.Name
-        FROM providers p
-        JOIN food fl ON p.Provider_ID = fl.Provider_ID
-        ORDER BY p.Name;
-        """
-        providers_list = get_data_for_display(providers_with_listings_query).iloc[:, 0].tolist()
-        provider_type=get_data_for_display("select distinct type from providers order by type;").iloc[:, 0].tolist()
-        receiver_type=get_data_for_display("select distinct type from receivers order by type;").iloc[:, 0].tolist()
-        food_types = get_data_for_display("SELECT DISTINCT Food_Type FROM food ORDER BY Food_Type;").iloc[:, 0].tolist()
-        meal_types = get_data_for_display("SELECT DISTINCT Meal_Type FROM food ORDER BY Meal_Type;").iloc[:, 0].tolist()
+        cities = get_data_for_display(CITIES_QUERY).iloc[:, 0].tolist()
+        providers_list = get_data_for_display(PROVIDERS_WITH_LISTINGS_QUERY).iloc[:, 0].tolist()
+        provider_type=get_data_for_display(PROVIDER_TYPES_QUERY).iloc[:, 0].tolist()
+        receiver_type=get_data_for_display(RECEIVER_TYPES_QUERY).iloc[:, 0].tolist()
+        food_types = get_data_for_display(FOOD_TYPES_QUERY).iloc[:, 0].tolist()
+        meal_types = get_data_for_display(MEAL_TYPES_QUERY).iloc[:, 0].tolist()
         return ["All"] + cities, ["All"] + providers_list,["All"] + provider_type,["All"] + receiver_type, ["All"] + food_types, ["All"] + meal_types
     cities, providers_list, provider_type,receiver_type,food_types, meal_types = get_filter_options()
 
@@ -66,48 +64,10 @@ with tab1:
     selected_meal_type = st.sidebar.selectbox("Meal Type:", meal_types)
                              
 # --- Build Filtered Query ---
-    filter_query = """
-    SELECT
-        fl.Food_Name,
-        fl.Quantity,
-        fl.Expiry_Date,
-        fl.Food_Type,
-        fl.Meal_Type,
-        p.Name AS Provider_Name,
-        p.Type AS Provider_Type,
-        p.City AS Provider_City,
-        p.Contact AS Provider_Contact
-        r.receiver_type as receiver_type
-    FROM food fl
-    JOIN providers p ON fl.Provider_ID = p.Provider_ID
-    join claims c ON c.food_id=fl.food_id
-    join receivers r on r.receiver_id=c.receiver_id
-    WHERE fl.Expiry_Date >= c.timestamp -- Only show unexpired food
-    """
-    query_params = []
-
-    if selected_city != "All":
-        filter_query += " AND p.City = %s"
-        query_params.append(selected_city)
-    if selected_provider != "All":
-        filter_query += " AND p.Name = %s"
-        query_params.append(selected_provider)
-    if selected_provider_type != "All:":
-        filter_query += " AND p.type = %s"
-        query_params.append(selected_provider_type)
-    if selected_receiver_type != "All":
-        filter_query += " AND r.receiver_type = %s"
-        query_params.append(selected_receiver_type)
-    if selected_food_type != "All":
-        filter_query += " AND fl.Food_Type = %s"
-        query_params.append(selected_food_type)
-    if selected_meal_type != "All":
-        filter_query += " AND fl.Meal_Type = %s"
-        query_params.append(selected_meal_type)
-
-    filter_query += " ORDER BY fl.Expiry_Date ASC, p.Name, fl.Food_Name;"
-
-    filtered_listings_df = get_data_for_display(filter_query, tuple(query_params) if query_params else None)
+    filter_query, query_params = build_filter_query(selected_city, selected_provider, selected_provider_type,
+                                                    selected_receiver_type, selected_food_type, selected_meal_type)
+
+    filtered_listings_df = get_data_for_display(filter_query, query_params)
 
     if not filtered_listings_df.empty:
         st.subheader("Filtered Food Listings")
@@ -127,17 +87,11 @@ with tab1:
     st.subheader("Key Performance Indicators (KPIs)")
 
     # Example KPIs - fetching values for st.metric
-    total_food_available_query = "SELECT SUM(Quantity) FROM food;"
-    total_claims_query = "SELECT COUNT(Claim_ID) FROM claims;"
-    total_providers_query = "SELECT COUNT(Provider_ID) FROM providers;"
-    most_claimed_mealtype_query = "SELECT MEAL_TYPE FROM(SELECT A.MEAL_TYPE,COUNT(*) AS CLAIMED FROM FOOD AS A JOIN CLAIMS AS B ON A.FOOD_ID=B.FOOD_ID GROUP BY 1 ORDER BY 2 DESC LIMIT 1);"
-    city_highest_food_query="SELECT LOCATION AS CITY, COUNT(*) AS LISTING FROM FOOD GROUP BY 1 ORDER BY 2 DESC LIMIT 1;"
-
-    total_food_available = get_data_for_display(total_food_available_query).iloc[0, 0] if not get_data_for_display(total_food_available_query).empty else 0
-    total_claims = get_data_for_display(total_claims_query).iloc[0, 0] if not get_data_for_display(total_claims_query).empty else 0
-    total_providers = get_data_for_display(total_providers_query).iloc[0, 0] if not get_data_for_display(total_providers_query).empty else 0
-    most_mealtype = get_data_for_display(most_claimed_mealtype_query).iloc[0,0] if not get_data_for_display(most_claimed_mealtype_query).empty else 0
-    city_highest_food = get_data_for_display(city_highest_food_query).iloc[0,0] if not get_data_for_display(city_highest_food_query).empty else 0
+    total_food_available = get_data_for_display(TOTAL_FOOD_AVAILABLE_QUERY).iloc[0, 0] if not get_data_for_display(TOTAL_FOOD_AVAILABLE_QUERY).empty else 0
+    total_claims = get_data_for_display(TOTAL_CLAIMS_QUERY).iloc[0, 0] if not get_data_for_display(TOTAL_CLAIMS_QUERY).empty else 0
+    total_providers = get_data_for_display(TOTAL_PROVIDERS_QUERY).iloc[0, 0] if not get_data_for_display(TOTAL_PROVIDERS_QUERY).empty else 0
+    most_mealtype = get_data_for_display(MOST_CLAIMED_MEALTYPE_QUERY).iloc[0,0] if not get_data_for_display(MOST_CLAIMED_MEALTYPE_QUERY).empty else 0
+    city_highest_food = get_data_for_display(CITY_HIGHEST_FOOD_QUERY).iloc[0,0] if not get_data_for_display(CITY_HIGHEST_FOOD_QUERY).empty else 0
 
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
@@ -156,14 +110,7 @@ with tab1:
     st.subheader("Visualizing Trends")
 
     # Example: Bar chart for food contribution by provider type
-    provider_contribution_query = """
-    SELECT p.Type AS Provider_Type, SUM(fl.Quantity) AS Total_Food_Quantity
-    FROM food fl
-    JOIN providers p ON fl.Provider_ID = p.Provider_ID
-    GROUP BY p.Type
-    ORDER BY Total_Food_Quantity DESC;
-    """
-    provider_contribution_df = get_data_for_display(provider_contribution_query)
+    provider_contribution_df = get_data_for_display(PROVIDER_CONTRIBUTION_QUERY)
     col1,col2=st.columns(2)
     with col1:
         if not provider_contribution_df.empty:
@@ -173,12 +120,7 @@ with tab1:
            st.info("No data to display for provider contribution.")
 
     # Example: Pie chart (or bar) for claim status percentage
-    claim_status_query = """
-    SELECT Status, COUNT(*) AS Num_Claims
-    FROM claims
-    GROUP BY Status;
-    """
-    claim_status_df = get_data_for_display(claim_status_query)
+    claim_status_df = get_data_for_display(CLAIM_STATUS_QUERY)
     with col2:
         if not claim_status_df.empty:
            st.write("#### Claim Status Distribution")
@@ -189,9 +131,7 @@ with tab1:
         else:
            st.info("No claim status data to display.")
 
-    date_trend_query = """ select extract(day from timestamp) as date,
-                        count(*) as claimed from claims group by date"""
-    date_trend_df = get_data_for_display(date_trend_query)
+    date_trend_df = get_data_for_display(DATE_TREND_QUERY)
     if not date_trend_df.empty:
         st.write("#### Date Trend")
         st.line_chart(date_trend_df.set_index('date'))
@@ -204,132 +144,8 @@ with tab2:
     st.header("Deep Dive: SQL Query Results & Analysis")
     st.write("Explore detailed insights from the 15 pre-defined SQL queries.")
 
-    # Define all your SQL queries with titles and optional parameters
-    # The queries are the same as provided in our previous discussion
-    queries_to_display = [
-        ("1. Providers & Receivers per City", """
-        SELECT City,
-               COUNT(DISTINCT Provider_ID) AS Num_Providers,
-               COUNT(DISTINCT Receiver_ID) AS Num_Receivers
-        FROM providers
-        FULL OUTER JOIN receivers USING (City)
-        GROUP BY City
-        ORDER BY City;
-        """),
-        ("2. Food Contribution by Provider Type", """
-        SELECT p.Type AS Provider_Type,
-               SUM(fl.Quantity) AS Total_Food_Quantity
-        FROM food fl
-        JOIN providers p ON fl.Provider_ID = p.Provider_ID
-        GROUP BY p.Type
-        ORDER BY Total_Food_Quantity DESC;
-        """),
-        ("3. Contact Info of Providers in a Specific City ", """
-        SELECT City,Name,address,Contact
-        FROM providers;
-        """), # Example parameter. You can make this dynamic with st.selectbox/st.text_input
-        ("4. Receivers Claimed Most Food", """
-        SELECT r.Name AS Receiver_Name,
-               SUM(fl.Quantity) AS Total_Food_Claimed
-        FROM claims c
-        JOIN food fl ON c.Food_ID = fl.Food_ID
-        JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
-        WHERE c.Status = 'Completed'
-        GROUP BY r.Name
-        ORDER BY Total_Food_Claimed DESC
-        LIMIT 10;
-        """),
-        ("5. Total Quantity of Unexpired Food Available", """
-        SELECT SUM(f.Quantity) AS Total_Available_Food
-        FROM food f
-        WHERE f.Expiry_Date >= (select timestamp::date from claims);
-        """),
-        ("6. City with Highest Number of Food Listings", """
-        SELECT Location AS City,
-               COUNT(Food_ID) AS Number_Of_Listings
-        FROM food
-        GROUP BY Location
-        ORDER BY Number_Of_Listings DESC
-        LIMIT 1;
-        """),
-        ("7. Most Commonly Available Food Types", """
-        SELECT Food_Type,
-               COUNT(Food_ID) AS Number_Of_Listings
-        FROM food
-        GROUP BY Food_Type
-        ORDER BY Number_Of_Listings DESC;
-        """),
-        ("8. How many food claims have been made for each food item?", """
-        SELECT fl.Food_Name,
-               COUNT(c.Claim_ID) AS Number_Of_Claims
-        FROM food fl
-        LEFT JOIN claims c ON fl.Food_ID = c.Food_ID
-        GROUP BY fl.Food_Name
-        ORDER BY Number_Of_Claims DESC;
-        """),
-        ("9. Which provider has had the highest number of successful food claims?", """
-        SELECT p.Name AS Provider_Name,
-               COUNT(c.Claim_ID) AS Number_Of_Successful_Claims
-        FROM providers p
-        JOIN food fl ON p.Provider_ID = fl.Provider_ID
-        JOIN claims c ON fl.Food_ID = c.Food_ID
-        WHERE c.Status = 'Completed'
-        GROUP BY p.Name
-        ORDER BY Number_Of_Successful_Claims DESC
-        LIMIT 1;
-        """),
-        ("10. What percentage of food claims are completed vs. pending vs. canceled?", """
-        SELECT Status,
-               COUNT(*) AS Num_Claims,
-               ROUND((COUNT(*) * 100.0) / (SELECT COUNT(*) FROM claims), 2) AS Percentage
-        FROM claims
-        GROUP BY Status
-        ORDER BY Num_Claims DESC;
-        """),
-        ("11. What is the average quantity of food claimed per receiver?", """
-        SELECT AVG(Total_Food_Claimed) AS Average_Quantity_Claimed_Per_Receiver
-        FROM (
-            SELECT r.Receiver_ID, SUM(fl.Quantity) AS Total_Food_Claimed
-            FROM claims c
-            JOIN food fl ON c.Food_ID = fl.Food_ID
-            JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
-            WHERE c.Status = 'Completed'
-            GROUP BY r.Receiver_ID
-        ) AS ReceiverClaims;
-        """),
-        ("12. Which meal type (breakfast, lunch, dinner, snacks) is claimed the most?", """
-        SELECT fl.Meal_Type,
-               COUNT(c.Claim_ID) AS Number_Of_Claims
-        FROM claims c
-        JOIN food fl ON c.Food_ID = fl.Food_ID
-        WHERE c.Status = 'Completed'
-        GROUP BY fl.Meal_Type
-        ORDER BY Number_Of_Claims DESC;
-        """),
-        ("13. What is the total quantity of food donated by each provider?", """
-        SELECT p.Name AS Provider_Name,
-               SUM(fl.Quantity) AS Total_Donated_Quantity
-        FROM providers p
-        JOIN food fl ON p.Provider_ID = fl.Provider_ID
-        GROUP BY p.Name
-        ORDER BY Total_Donated_Quantity DESC;
-        """),
-        ("14. List all food items expiring in the next 7 days", """
-        SELECT Food_Name, Quantity, Expiry_Date, p.Name as Provider_Name, p.City as Provider_City
-        FROM food fl
-        JOIN providers p ON fl.Provider_ID = p.Provider_ID
-        WHERE Expiry_Date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '7 days'
-        ORDER BY Expiry_Date ASC;
-        """),
-        ("15. Show unfulfilled claims (pending claims) with food and receiver details", """
-        SELECT c.Claim_ID, fl.Food_Name, fl.Quantity, r.Name AS Receiver_Name, r.Contact AS Receiver_Contact, c.Timestamp
-        FROM claims c
-        JOIN food fl ON c.Food_ID = fl.Food_ID
-        JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
-        WHERE c.Status = 'Pending'
-        ORDER BY c.Timestamp DESC;
-        """)
-    ]
+    # The queries are defined in queries.py so the index advisor sees the same SQL
+    queries_to_display = ANALYSIS_QUERIES
 
     for i, (title, query, *params) in enumerate(queries_to_display):
         with st.expander(f"Query {i+1}: {title}"):
@@ -0,0 +1,494 @@
+import argparse
+import sys
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import Json
+
+import queries
+from database import connect_db
+
+# --- 1. Versioned Schema Migrations ---
+# Each migration is (version, description, SQL). They are applied in order, once each,
+# and the applied versions are recorded in the schema_migrations table.
+# Never edit a migration that has already shipped: append a new one instead.
+MIGRATIONS = [
+    # On a database whose tables were imported by hand this is a no-op;
+    # migration 5 back-fills the keys and sequences such tables are missing.
+    (1, "create base tables", """
+    CREATE TABLE IF NOT EXISTS providers (
+        provider_id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL,
+        type TEXT,
+        address TEXT,
+        city TEXT,
+        contact TEXT
+    );
+    CREATE TABLE IF NOT EXISTS receivers (
+        receiver_id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL,
+        type TEXT,
+        city TEXT,
+        contact TEXT
+    );
+    CREATE TABLE IF NOT EXISTS food (
+        food_id SERIAL PRIMARY KEY,
+        food_name TEXT NOT NULL,
+        quantity INTEGER,
+        expiry_date DATE,
+        provider_id INTEGER REFERENCES providers (provider_id) ON DELETE CASCADE,
+        provider_type TEXT,
+        location TEXT,
+        food_type TEXT,
+        meal_type TEXT
+    );
+    CREATE TABLE IF NOT EXISTS claims (
+        claim_id SERIAL PRIMARY KEY,
+        food_id INTEGER REFERENCES food (food_id) ON DELETE CASCADE,
+        receiver_id INTEGER REFERENCES receivers (receiver_id) ON DELETE CASCADE,
+        status TEXT,
+        timestamp TIMESTAMP
+    );
+    """),
+    # Replaces the hand-run ALTER in 'food wastage.sql'. Only converts when the column
+    # is still text (i.e. the CSV was imported as-is), so it is safe on fresh databases.
+    (2, "convert food.expiry_date to DATE", """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'food'
+              AND column_name = 'expiry_date'
+              AND data_type IN ('text', 'character varying')
+        ) THEN
+            ALTER TABLE food
+            ALTER COLUMN expiry_date TYPE DATE
+            USING TO_DATE(expiry_date, 'MM/DD/YYYY');
+        END IF;
+    END $$;
+    """),
+    # cost_before, cost_after and speedup are for deciding_query, the query whose speedup
+    # justified the index; costs for the whole workload are in query_costs (migration 4).
+    (3, "create index advisor log", """
+    CREATE TABLE IF NOT EXISTS index_advisor_log (
+        log_id SERIAL PRIMARY KEY,
+        index_name TEXT NOT NULL,
+        table_name TEXT NOT NULL,
+        columns TEXT NOT NULL,
+        deciding_query TEXT NOT NULL,
+        cost_before NUMERIC NOT NULL,
+        cost_after NUMERIC NOT NULL,
+        speedup NUMERIC NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+    );
+    """),
+    # {query name: {"before": cost, "after": cost, "speedup": ratio}} for each workload query.
+    (4, "record per-query costs in index advisor log", """
+    ALTER TABLE index_advisor_log ADD COLUMN IF NOT EXISTS query_costs JSONB;
+    """),
+    # Tables imported by hand have no primary keys, id sequences or foreign keys, and
+    # database.delete_food_listing relies on the cascade. Add whatever is missing, and fail
+    # loudly on a foreign key that exists without ON DELETE CASCADE.
+    (5, "enforce primary keys, id sequences and cascading foreign keys", """
+    DO $$
+    DECLARE
+        id_column RECORD;
+        fk RECORD;
+        seq_name TEXT;
+    BEGIN
+        FOR id_column IN SELECT * FROM (VALUES
+            ('providers', 'provider_id'),
+            ('receivers', 'receiver_id'),
+            ('food', 'food_id'),
+            ('claims', 'claim_id')
+        ) AS t(table_name, column_name) LOOP
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conrelid = id_column.table_name::regclass AND contype = 'p'
+            ) THEN
+                EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (%I)',
+                               id_column.table_name, id_column.column_name);
+            END IF;
+            seq_name := pg_get_serial_sequence(id_column.table_name, id_column.column_name);
+            IF seq_name IS NULL THEN
+                seq_name := id_column.table_name || '_' || id_column.column_name || '_seq';
+                EXECUTE format('CREATE SEQUENCE %I OWNED BY %I.%I',
+                               seq_name, id_column.table_name, id_column.column_name);
+                EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT nextval(%L)',
+                               id_column.table_name, id_column.column_name, seq_name);
+            END IF;
+            EXECUTE format('SELECT setval(%L, COALESCE(MAX(%I), 0) + 1, false) FROM %I',
+                           seq_name, id_column.column_name, id_column.table_name);
+        END LOOP;
+
+        FOR fk IN SELECT * FROM (VALUES
+            ('food', 'provider_id', 'providers', 'provider_id'),
+            ('claims', 'food_id', 'food', 'food_id'),
+            ('claims', 'receiver_id', 'receivers', 'receiver_id')
+        ) AS t(table_name, column_name, ref_table, ref_column) LOOP
+            IF EXISTS (
+                SELECT 1 FROM pg_constraint c
+                JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attname = fk.column_name
+                WHERE c.conrelid = fk.table_name::regclass AND c.contype = 'f'
+                  AND c.confrelid = fk.ref_table::regclass AND c.conkey = ARRAY[a.attnum]
+                  AND c.confdeltype <> 'c'
+            ) THEN
+                RAISE EXCEPTION '%.% references % without ON DELETE CASCADE; drop that constraint and re-run migrate',
+                                fk.table_name, fk.column_name, fk.ref_table;
+            END IF;
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint c
+                JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attname = fk.column_name
+                WHERE c.conrelid = fk.table_name::regclass AND c.contype = 'f'
+                  AND c.confrelid = fk.ref_table::regclass AND c.conkey = ARRAY[a.attnum]
+            ) THEN
+                EXECUTE format('ALTER TABLE %I ADD FOREIGN KEY (%I) REFERENCES %I (%I) ON DELETE CASCADE',
+                               fk.table_name, fk.column_name, fk.ref_table, fk.ref_column);
+            END IF;
+        END LOOP;
+    END $$;
+    """),
+]
+
+# Tables the dashboard reads, with their id columns.
+ID_COLUMNS = [
+    ("providers", "provider_id"),
+    ("receivers", "receiver_id"),
+    ("food", "food_id"),
+    ("claims", "claim_id"),
+]
+WORKLOAD_TABLES = [table for table, _ in ID_COLUMNS]
+
+# --- 2. Registered Query Workload ---
+# The index advisor optimises for these queries. They come from queries.py, the same SQL
+# the dashboard in food.py runs; register new ones with register_query() when adding pages.
+WORKLOAD_QUERIES = []
+
+
+def register_query(name, query, params=None):
+    """
+    Adds a query to the workload the index advisor measures.
+    Args:
+        name (str): A short label used in the advisor's output and log.
+        query (str): The SQL query string (SELECT only).
+        params (tuple, optional): Sample parameters for the query's placeholders.
+    """
+    WORKLOAD_QUERIES.append((name, query, params))
+
+
+for title, query in queries.FILTER_OPTION_QUERIES + queries.KPI_QUERIES:
+    register_query(title, query)
+register_query("Filtered listings", *queries.build_filter_query())
+register_query("Filtered listings by city", *queries.build_filter_query(city="New Jessica"))
+register_query("Filtered listings by provider and receiver type",
+               *queries.build_filter_query(provider_type="Supermarket", receiver_type="Shelter"))
+register_query("Filtered listings by food and meal type",
+               *queries.build_filter_query(food_type="Vegetarian", meal_type="Lunch"))
+for title, query, *params in queries.ANALYSIS_QUERIES:
+    register_query(title, query, params[0] if params else None)
+
+# --- 3. Candidate Indexes ---
+# (index name, table, columns). The advisor keeps only those that measurably help.
+# Every index slows down the app's writes (add_provider, update_claim_status, cascading
+# deletes), so avoid candidates that another candidate already covers.
+CANDIDATE_INDEXES = [
+    ("idx_food_provider_id", "food", ("provider_id",)),
+    ("idx_claims_food_id", "claims", ("food_id",)),
+    ("idx_claims_receiver_id", "claims", ("receiver_id",)),
+    ("idx_claims_status_food_id", "claims", ("status", "food_id")),
+    ("idx_food_expiry_date", "food", ("expiry_date",)),
+    ("idx_providers_city", "providers", ("city",)),
+    ("idx_food_location", "food", ("location",)),
+    ("idx_food_food_type_meal_type", "food", ("food_type", "meal_type")),
+]
+
+
+# --- 4. Migration Runner ---
+def get_schema_version(conn):
+    """
+    Returns the highest applied migration version.
+    Args:
+        conn (psycopg2.connection): An open connection.
+    Returns:
+        int: The current schema version, 0 if no migrations have been applied.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+        """)
+        cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations;")
+        version = cur.fetchone()[0]
+    conn.commit()
+    return version
+
+
+def migrate(conn=None):
+    """
+    Applies all pending migrations in order, each in its own transaction.
+    Args:
+        conn (psycopg2.connection, optional): An open connection. If omitted, one is opened
+                                              with connect_db() and closed afterwards.
+    Returns:
+        int or None: The schema version after migrating, None if a migration failed.
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = connect_db()
+        if conn is None:
+            return None
+    try:
+        version = get_schema_version(conn)
+        for migration_version, description, migration_sql in MIGRATIONS:
+            if migration_version <= version:
+                continue
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(migration_sql)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, description) VALUES (%s, %s);",
+                        (migration_version, description)
+                    )
+                conn.commit()
+                version = migration_version
+                print(f"Applied migration {migration_version}: {description}")
+            except psycopg2.Error as e:
+                conn.rollback()
+                print(f"Error applying migration {migration_version} ({description}): {e}")
+                return None
+        return version
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def sync_id_sequences(conn=None):
+    """
+    Moves each id sequence past the highest id in its table.
+    Run this after importing the CSVs, which carry explicit ids; otherwise inserts that rely
+    on the sequence (e.g. database.add_provider) fail with duplicate keys.
+    Args:
+        conn (psycopg2.connection, optional): An open connection. If omitted, one is opened
+                                              with connect_db() and closed afterwards.
+    Returns:
+        bool: True if every sequence was updated, False otherwise.
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = connect_db()
+        if conn is None:
+            return False
+    try:
+        with conn.cursor() as cur:
+            for table, column in ID_COLUMNS:
+                cur.execute("SELECT pg_get_serial_sequence(%s, %s);", (table, column))
+                sequence = cur.fetchone()[0]
+                if sequence is None:
+                    conn.rollback()
+                    print(f"Error synchronising id sequences: {table}.{column} has no sequence. "
+                          f"Run 'python migrations.py migrate' first.")
+                    return False
+                cur.execute(sql.SQL(
+                    "SELECT setval(%s, COALESCE(MAX({}), 0) + 1, false) FROM {};"
+                ).format(sql.Identifier(column), sql.Identifier(table)), (sequence,))
+        conn.commit()
+        print("Id sequences synchronised with imported data.")
+        return True
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"Error synchronising id sequences: {e}")
+        return False
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+# --- 5. Index Advisor ---
+EMPTY_TABLES_QUERY = """
+SELECT relname FROM pg_class
+WHERE relnamespace = current_schema()::regnamespace AND relkind = 'r'
+  AND relname = ANY(%s) AND reltuples <= 0;
+"""
+
+# Plain column indexes only: expression and partial indexes do not cover a candidate.
+EXISTING_INDEXES_QUERY = """
+SELECT t.relname, i.relname,
+       ARRAY(SELECT a.attname::text
+             FROM unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+             JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+             ORDER BY k.ord)
+FROM pg_index ix
+JOIN pg_class t ON t.oid = ix.indrelid
+JOIN pg_class i ON i.oid = ix.indexrelid
+WHERE t.relnamespace = current_schema()::regnamespace
+  AND ix.indexprs IS NULL AND ix.indpred IS NULL;
+"""
+
+
+def _query_costs(cur, workload):
+    """Returns {query name: planner's estimated total cost} for the given workload queries."""
+    costs = {}
+    for name, query, params in workload:
+        cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+        plan = cur.fetchone()[0]
+        costs[name] = plan[0]["Plan"]["Total Cost"]
+    return costs
+
+
+def _is_covered(columns, index_columns):
+    """True if columns are a leading prefix of (or equal to) an index's columns."""
+    return tuple(index_columns[:len(columns)]) == tuple(columns)
+
+
+def advise_indexes(conn=None, workload=None, candidates=None, min_speedup=1.25, min_cost_saving=10.0):
+    """
+    Greedily tries each candidate index against the registered query workload.
+    For every candidate, each query is EXPLAINed before and after creating the index inside
+    a transaction. A query qualifies if it gets at least min_speedup times cheaper and saves
+    at least min_cost_saving. The index is kept if any query qualifies, otherwise it is
+    rolled back. The qualifying query with the largest saving is the deciding query; its
+    costs and speedup are logged to index_advisor_log along with every query's costs.
+    Candidates already covered by an existing or applied index are skipped.
+
+    Run migrate() first, and run this only after the CSVs are imported: on empty tables the
+    estimates are meaningless, so the advisor refuses to run. Re-run it when the data or the
+    registered queries change, since earlier rejections are not revisited automatically.
+    Args:
+        conn (psycopg2.connection, optional): An open connection. If omitted, one is opened
+                                              with connect_db() and closed afterwards.
+        workload (list, optional): (name, query, params) tuples. Defaults to WORKLOAD_QUERIES.
+        candidates (list, optional): (index name, table, columns) tuples. Defaults to CANDIDATE_INDEXES.
+        min_speedup (float): The cost_before / cost_after ratio a query must reach.
+        min_cost_saving (float): The planner cost units a query must save. Every index slows
+                                 down writes, so one is not kept for a query that is already cheap.
+    Returns:
+        list or None: (index name, deciding query, its speedup, per-query costs) for each
+                      index applied, None if the advisor could not run.
+    """
+    workload = WORKLOAD_QUERIES if workload is None else workload
+    candidates = CANDIDATE_INDEXES if candidates is None else candidates
+    applied = []
+    owns_conn = conn is None
+    if owns_conn:
+        conn = connect_db()
+        if conn is None:
+            return None
+    try:
+        version = get_schema_version(conn)
+        if version < MIGRATIONS[-1][0]:
+            print(f"Schema is at version {version}; run 'python migrations.py migrate' before the index advisor.")
+            return None
+
+        with conn.cursor() as cur:
+            # Fresh statistics so the planner's estimates reflect the loaded data.
+            cur.execute(sql.SQL("ANALYZE {};").format(
+                sql.SQL(", ").join(sql.Identifier(table) for table in WORKLOAD_TABLES)
+            ))
+            conn.commit()
+
+            cur.execute(EMPTY_TABLES_QUERY, (WORKLOAD_TABLES,))
+            empty_tables = [row[0] for row in cur.fetchall()]
+            conn.rollback()
+            if empty_tables:
+                print(f"Tables {', '.join(empty_tables)} are empty; import the CSVs before running the index advisor.")
+                return None
+
+            # Drop queries that do not plan (e.g. they reference a missing column).
+            valid_queries = []
+            for query_entry in workload:
+                try:
+                    _query_costs(cur, [query_entry])
+                    valid_queries.append(query_entry)
+                except psycopg2.Error as e:
+                    print(f"Skipping workload query '{query_entry[0]}': {e}")
+                conn.rollback()
+            if not valid_queries:
+                print("No plannable queries in the workload; nothing to advise.")
+                return None
+
+            cur.execute(EXISTING_INDEXES_QUERY)
+            existing_names = set()
+            existing_columns = []
+            for table, index_name, columns in cur.fetchall():
+                existing_names.add(index_name)
+                existing_columns.append((table, tuple(columns)))
+            conn.rollback()
+
+            for index_name, table, columns in candidates:
+                if index_name in existing_names or any(
+                    indexed_table == table and _is_covered(columns, index_columns)
+                    for indexed_table, index_columns in existing_columns
+                ):
+                    print(f"Skipped {index_name}: already covered by an existing index")
+                    continue
+                try:
+                    costs_before = _query_costs(cur, valid_queries)
+                    cur.execute(sql.SQL("CREATE INDEX {} ON {} ({});").format(
+                        sql.Identifier(index_name),
+                        sql.Identifier(table),
+                        sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+                    ))
+                    costs_after = _query_costs(cur, valid_queries)
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    print(f"Error evaluating index {index_name}: {e}")
+                    continue
+
+                query_costs = {}
+                for name, before in costs_before.items():
+                    after = costs_after[name]
+                    query_costs[name] = {
+                        "before": before,
+                        "after": after,
+                        "speedup": before / after if after > 0 else 1.0,
+                    }
+                qualifying = [
+                    name for name, costs in query_costs.items()
+                    if costs["speedup"] >= min_speedup and costs["before"] - costs["after"] >= min_cost_saving
+                ]
+                if not qualifying:
+                    conn.rollback()
+                    print(f"Rejected {index_name}: no query reached {min_speedup:.2f}x "
+                          f"with a saving of at least {min_cost_saving:.2f}")
+                    continue
+
+                deciding_query = max(qualifying, key=lambda name: query_costs[name]["before"] - query_costs[name]["after"])
+                deciding = query_costs[deciding_query]
+                cur.execute("""
+                INSERT INTO index_advisor_log
+                    (index_name, table_name, columns, deciding_query, cost_before, cost_after, speedup, query_costs)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+                """, (index_name, table, ", ".join(columns), deciding_query,
+                      deciding["before"], deciding["after"], deciding["speedup"], Json(query_costs)))
+                conn.commit()
+                existing_names.add(index_name)
+                existing_columns.append((table, tuple(columns)))
+                applied.append((index_name, deciding_query, deciding["speedup"], query_costs))
+                print(f"Applied {index_name}: '{deciding_query}' {deciding['speedup']:.2f}x faster, "
+                      f"cost {deciding['before']:.2f} -> {deciding['after']:.2f}")
+        return applied
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"Error running index advisor: {e}")
+        return None
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    # Typical order: migrate, import the CSVs, sync-sequences, advise.
+    # Exits with status 1 if the command fails, so setup scripts can stop on errors.
+    parser = argparse.ArgumentParser(description="Manage the food wastage database schema.")
+    parser.add_argument("command", choices=["migrate", "sync-sequences", "advise"])
+    args = parser.parse_args()
+    if args.command == "migrate":
+        succeeded = migrate() is not None
+    elif args.command == "sync-sequences":
+        succeeded = sync_id_sequences()
+    else:
+        succeeded = advise_indexes() is not None
+    sys.exit(0 if succeeded else 1)
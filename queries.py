@@ -0,0 +1,237 @@
+# SQL shared by the dashboard (food.py) and the index advisor (migrations.py).
+# Keep read queries here so the advisor always measures what the dashboard actually runs.
+
+# --- 1. Filter Options ---
+CITIES_QUERY = "SELECT DISTINCT City FROM providers ORDER BY City;"
+# For provider names, join providers and food_listings to get only providers with listings
+PROVIDERS_WITH_LISTINGS_QUERY = """
+SELECT DISTINCT p.Name
+FROM providers p
+JOIN food fl ON p.Provider_ID = fl.Provider_ID
+ORDER BY p.Name;
+"""
+PROVIDER_TYPES_QUERY = "select distinct type from providers order by type;"
+RECEIVER_TYPES_QUERY = "select distinct type from receivers order by type;"
+FOOD_TYPES_QUERY = "SELECT DISTINCT Food_Type FROM food ORDER BY Food_Type;"
+MEAL_TYPES_QUERY = "SELECT DISTINCT Meal_Type FROM food ORDER BY Meal_Type;"
+
+FILTER_OPTION_QUERIES = [
+    ("Cities", CITIES_QUERY),
+    ("Providers with listings", PROVIDERS_WITH_LISTINGS_QUERY),
+    ("Provider types", PROVIDER_TYPES_QUERY),
+    ("Receiver types", RECEIVER_TYPES_QUERY),
+    ("Food types", FOOD_TYPES_QUERY),
+    ("Meal types", MEAL_TYPES_QUERY),
+]
+
+
+# --- 2. Filtered Food Listings ---
+def build_filter_query(city="All", provider="All", provider_type="All", receiver_type="All",
+                       food_type="All", meal_type="All"):
+    """
+    Builds the dashboard's filtered listings query. "All" leaves a filter out.
+    Returns:
+        tuple: (query string, tuple of parameters or None).
+    """
+    filter_query = """
+    SELECT
+        fl.Food_Name,
+        fl.Quantity,
+        fl.Expiry_Date,
+        fl.Food_Type,
+        fl.Meal_Type,
+        p.Name AS Provider_Name,
+        p.Type AS Provider_Type,
+        p.City AS Provider_City,
+        p.Contact AS Provider_Contact,
+        r.type as receiver_type
+    FROM food fl
+    JOIN providers p ON fl.Provider_ID = p.Provider_ID
+    join claims c ON c.food_id=fl.food_id
+    join receivers r on r.receiver_id=c.receiver_id
+    WHERE fl.Expiry_Date >= c.timestamp -- Only show unexpired food
+    """
+    query_params = []
+
+    if city != "All":
+        filter_query += " AND p.City = %s"
+        query_params.append(city)
+    if provider != "All":
+        filter_query += " AND p.Name = %s"
+        query_params.append(provider)
+    if provider_type != "All":
+        filter_query += " AND p.type = %s"
+        query_params.append(provider_type)
+    if receiver_type != "All":
+        filter_query += " AND r.type = %s"
+        query_params.append(receiver_type)
+    if food_type != "All":
+        filter_query += " AND fl.Food_Type = %s"
+        query_params.append(food_type)
+    if meal_type != "All":
+        filter_query += " AND fl.Meal_Type = %s"
+        query_params.append(meal_type)
+
+    filter_query += " ORDER BY fl.Expiry_Date ASC, p.Name, fl.Food_Name;"
+    return filter_query, tuple(query_params) if query_params else None
+
+
+# --- 3. KPIs and Trends ---
+TOTAL_FOOD_AVAILABLE_QUERY = "SELECT SUM(Quantity) FROM food;"
+TOTAL_CLAIMS_QUERY = "SELECT COUNT(Claim_ID) FROM claims;"
+TOTAL_PROVIDERS_QUERY = "SELECT COUNT(Provider_ID) FROM providers;"
+MOST_CLAIMED_MEALTYPE_QUERY = "SELECT MEAL_TYPE FROM(SELECT A.MEAL_TYPE,COUNT(*) AS CLAIMED FROM FOOD AS A JOIN CLAIMS AS B ON A.FOOD_ID=B.FOOD_ID GROUP BY 1 ORDER BY 2 DESC LIMIT 1);"
+CITY_HIGHEST_FOOD_QUERY = "SELECT LOCATION AS CITY, COUNT(*) AS LISTING FROM FOOD GROUP BY 1 ORDER BY 2 DESC LIMIT 1;"
+
+PROVIDER_CONTRIBUTION_QUERY = """
+SELECT p.Type AS Provider_Type, SUM(fl.Quantity) AS Total_Food_Quantity
+FROM food fl
+JOIN providers p ON fl.Provider_ID = p.Provider_ID
+GROUP BY p.Type
+ORDER BY Total_Food_Quantity DESC;
+"""
+CLAIM_STATUS_QUERY = """
+SELECT Status, COUNT(*) AS Num_Claims
+FROM claims
+GROUP BY Status;
+"""
+DATE_TREND_QUERY = """ select extract(day from timestamp) as date,
+                    count(*) as claimed from claims group by date"""
+
+KPI_QUERIES = [
+    ("Total Food Available", TOTAL_FOOD_AVAILABLE_QUERY),
+    ("Total Claims Made", TOTAL_CLAIMS_QUERY),
+    ("Total Registered Providers", TOTAL_PROVIDERS_QUERY),
+    ("Most claimed Meal type", MOST_CLAIMED_MEALTYPE_QUERY),
+    ("City with highest food lisings", CITY_HIGHEST_FOOD_QUERY),
+    ("Food Quantity by Provider Type", PROVIDER_CONTRIBUTION_QUERY),
+    ("Claim Status Distribution", CLAIM_STATUS_QUERY),
+    ("Date Trend", DATE_TREND_QUERY),
+]
+
+# --- 4. SQL Analysis Queries ---
+# (title, query[, params]) tuples shown on the "SQL Analysis & Trends" tab.
+ANALYSIS_QUERIES = [
+    ("1. Providers & Receivers per City", """
+    SELECT City,
+           COUNT(DISTINCT Provider_ID) AS Num_Providers,
+           COUNT(DISTINCT Receiver_ID) AS Num_Receivers
+    FROM providers
+    FULL OUTER JOIN receivers USING (City)
+    GROUP BY City
+    ORDER BY City;
+    """),
+    ("2. Food Contribution by Provider Type", """
+    SELECT p.Type AS Provider_Type,
+           SUM(fl.Quantity) AS Total_Food_Quantity
+    FROM food fl
+    JOIN providers p ON fl.Provider_ID = p.Provider_ID
+    GROUP BY p.Type
+    ORDER BY Total_Food_Quantity DESC;
+    """),
+    ("3. Contact Info of Providers in a Specific City ", """
+    SELECT City,Name,address,Contact
+    FROM providers;
+    """),  # Example parameter. You can make this dynamic with st.selectbox/st.text_input
+    ("4. Receivers Claimed Most Food", """
+    SELECT r.Name AS Receiver_Name,
+           SUM(fl.Quantity) AS Total_Food_Claimed
+    FROM claims c
+    JOIN food fl ON c.Food_ID = fl.Food_ID
+    JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
+    WHERE c.Status = 'Completed'
+    GROUP BY r.Name
+    ORDER BY Total_Food_Claimed DESC
+    LIMIT 10;
+    """),
+    ("5. Total Quantity of Unexpired Food Available", """
+    SELECT SUM(f.Quantity) AS Total_Available_Food
+    FROM food f
+    WHERE f.Expiry_Date >= (select timestamp::date from claims);
+    """),
+    ("6. City with Highest Number of Food Listings", """
+    SELECT Location AS City,
+           COUNT(Food_ID) AS Number_Of_Listings
+    FROM food
+    GROUP BY Location
+    ORDER BY Number_Of_Listings DESC
+    LIMIT 1;
+    """),
+    ("7. Most Commonly Available Food Types", """
+    SELECT Food_Type,
+           COUNT(Food_ID) AS Number_Of_Listings
+    FROM food
+    GROUP BY Food_Type
+    ORDER BY Number_Of_Listings DESC;
+    """),
+    ("8. How many food claims have been made for each food item?", """
+    SELECT fl.Food_Name,
+           COUNT(c.Claim_ID) AS Number_Of_Claims
+    FROM food fl
+    LEFT JOIN claims c ON fl.Food_ID = c.Food_ID
+    GROUP BY fl.Food_Name
+    ORDER BY Number_Of_Claims DESC;
+    """),
+    ("9. Which provider has had the highest number of successful food claims?", """
+    SELECT p.Name AS Provider_Name,
+           COUNT(c.Claim_ID) AS Number_Of_Successful_Claims
+    FROM providers p
+    JOIN food fl ON p.Provider_ID = fl.Provider_ID
+    JOIN claims c ON fl.Food_ID = c.Food_ID
+    WHERE c.Status = 'Completed'
+    GROUP BY p.Name
+    ORDER BY Number_Of_Successful_Claims DESC
+    LIMIT 1;
+    """),
+    ("10. What percentage of food claims are completed vs. pending vs. canceled?", """
+    SELECT Status,
+           COUNT(*) AS Num_Claims,
+           ROUND((COUNT(*) * 100.0) / (SELECT COUNT(*) FROM claims), 2) AS Percentage
+    FROM claims
+    GROUP BY Status
+    ORDER BY Num_Claims DESC;
+    """),
+    ("11. What is the average quantity of food claimed per receiver?", """
+    SELECT AVG(Total_Food_Claimed) AS Average_Quantity_Claimed_Per_Receiver
+    FROM (
+        SELECT r.Receiver_ID, SUM(fl.Quantity) AS Total_Food_Claimed
+        FROM claims c
+        JOIN food fl ON c.Food_ID = fl.Food_ID
+        JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
+        WHERE c.Status = 'Completed'
+        GROUP BY r.Receiver_ID
+    ) AS ReceiverClaims;
+    """),
+    ("12. Which meal type (breakfast, lunch, dinner, snacks) is claimed the most?", """
+    SELECT fl.Meal_Type,
+           COUNT(c.Claim_ID) AS Number_Of_Claims
+    FROM claims c
+    JOIN food fl ON c.Food_ID = fl.Food_ID
+    WHERE c.Status = 'Completed'
+    GROUP BY fl.Meal_Type
+    ORDER BY Number_Of_Claims DESC;
+    """),
+    ("13. What is the total quantity of food donated by each provider?", """
+    SELECT p.Name AS Provider_Name,
+           SUM(fl.Quantity) AS Total_Donated_Quantity
+    FROM providers p
+    JOIN food fl ON p.Provider_ID = fl.Provider_ID
+    GROUP BY p.Name
+    ORDER BY Total_Donated_Quantity DESC;
+    """),
+    ("14. List all food items expiring in the next 7 days", """
+    SELECT Food_Name, Quantity, Expiry_Date, p.Name as Provider_Name, p.City as Provider_City
+    FROM food fl
+    JOIN providers p ON fl.Provider_ID = p.Provider_ID
+    WHERE Expiry_Date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '7 days'
+    ORDER BY Expiry_Date ASC;
+    """),
+    ("15. Show unfulfilled claims (pending claims) with food and receiver details", """
+    SELECT c.Claim_ID, fl.Food_Name, fl.Quantity, r.Name AS Receiver_Name, r.Contact AS Receiver_Contact, c.Timestamp
+    FROM claims c
+    JOIN food fl ON c.Food_ID = fl.Food_ID
+    JOIN receivers r ON c.Receiver_ID = r.Receiver_ID
+    WHERE c.Status = 'Pending'
+    ORDER BY c.Timestamp DESC;
+    """)
+]
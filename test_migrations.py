@@ -0,0 +1,242 @@
+import psycopg2
+from psycopg2 import sql
+
+import migrations
+
+LATEST_VERSION = migrations.MIGRATIONS[-1][0]
+
+
+def _first_identifier(composed):
+    """Returns the first identifier in a psycopg2.sql composition (the index name for CREATE INDEX)."""
+    for part in composed.seq:
+        if isinstance(part, sql.Identifier):
+            return part.strings[0]
+        if isinstance(part, sql.Composed):
+            found = _first_identifier(part)
+            if found:
+                return found
+    return None
+
+
+class FakeDatabase:
+    """
+    Stands in for a psycopg2 connection. Tracks what is committed and rolled back, and answers
+    EXPLAIN with a cost per query text that drops when an index listed in index_effects exists.
+    """
+
+    def __init__(self, schema_version=LATEST_VERSION, failing_sql=None, query_costs=None, index_effects=None,
+                 unplannable=(), existing_indexes=(), empty_tables=(), sequences=None):
+        self.schema_version = schema_version
+        if sequences is None:
+            sequences = {table: f"{table}_{column}_seq" for table, column in migrations.ID_COLUMNS}
+        self.sequences = sequences
+        self.failing_sql = failing_sql
+        self.query_costs = query_costs or {}
+        self.index_effects = index_effects or {}
+        self.unplannable = set(unplannable)
+        self.existing_indexes = list(existing_indexes)
+        self.empty_tables = list(empty_tables)
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.versions = []
+        self.indexes = []
+        self.log = []
+        self.setvals = []
+        self._pending = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+        for kind, value in self._pending:
+            getattr(self, kind).append(value)
+        self._pending = []
+
+    def rollback(self):
+        self.rollbacks += 1
+        self._pending = []
+
+    def close(self):
+        pass
+
+    def cost(self, query):
+        active = self.indexes + [value for kind, value in self._pending if kind == "indexes"]
+        costs = [self.query_costs[query]]
+        costs += [self.index_effects[name][query] for name in active if query in self.index_effects.get(name, {})]
+        return min(costs)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        db = self.db
+        if isinstance(query, sql.Composable):
+            if isinstance(query, sql.Composed) and "CREATE INDEX" in query.seq[0].string:
+                db._pending.append(("indexes", _first_identifier(query)))
+            elif isinstance(query, sql.Composed) and "setval" in query.seq[0].string:
+                db._pending.append(("setvals", params[0]))
+            db.executed.append(query)
+            return
+        db.executed.append(query)
+        if db.failing_sql and db.failing_sql in query:
+            raise psycopg2.Error("migration failed")
+        if "COALESCE(MAX(version), 0)" in query:
+            self.result = [(db.schema_version,)]
+        elif query.startswith("SELECT pg_get_serial_sequence"):
+            self.result = [(db.sequences.get(params[0]),)]
+        elif "INSERT INTO schema_migrations" in query:
+            db._pending.append(("versions", params[0]))
+        elif "reltuples" in query:
+            self.result = [(table,) for table in db.empty_tables]
+        elif "FROM pg_index" in query:
+            self.result = db.existing_indexes
+        elif query.startswith("EXPLAIN"):
+            workload_query = query[len("EXPLAIN (FORMAT JSON) "):]
+            if workload_query in db.unplannable:
+                raise psycopg2.Error("column does not exist")
+            self.result = [([{"Plan": {"Total Cost": db.cost(workload_query)}}],)]
+        elif "INSERT INTO index_advisor_log" in query:
+            db._pending.append(("log", params))
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+
+WORKLOAD = [
+    ("heavy join", "SELECT heavy", None),
+    ("pending claims", "SELECT pending", None),
+    ("lookup", "SELECT lookup", None),
+]
+COSTS = {"SELECT heavy": 1000.0, "SELECT pending": 100.0, "SELECT lookup": 5.0}
+
+
+def test_migrate_skips_applied_versions():
+    db = FakeDatabase(schema_version=2)
+    assert migrations.migrate(db) == LATEST_VERSION
+    assert db.versions == [version for version, _, _ in migrations.MIGRATIONS[2:]]
+    assert migrations.MIGRATIONS[0][2] not in db.executed
+    assert migrations.MIGRATIONS[1][2] not in db.executed
+
+
+def test_migrate_rolls_back_failing_migration():
+    db = FakeDatabase(schema_version=0, failing_sql="TO_DATE")
+    assert migrations.migrate(db) is None
+    assert db.rollbacks == 1
+    assert db.versions == [1]
+    assert migrations.MIGRATIONS[2][2] not in db.executed
+
+
+def test_sync_id_sequences_sets_every_sequence():
+    db = FakeDatabase()
+    assert migrations.sync_id_sequences(db) is True
+    assert db.setvals == list(db.sequences.values())
+
+
+def test_sync_id_sequences_fails_without_sequence():
+    db = FakeDatabase(sequences={"providers": "providers_provider_id_seq"})
+    assert migrations.sync_id_sequences(db) is False
+    assert db.setvals == []
+    assert db.rollbacks == 1
+
+
+def test_advise_keeps_index_that_speeds_up_one_query():
+    # 10x on "pending claims" is under 10% of the workload total, but still worth keeping.
+    db = FakeDatabase(query_costs=COSTS, index_effects={"idx_claims_status": {"SELECT pending": 10.0}})
+    applied = migrations.advise_indexes(db, WORKLOAD, [("idx_claims_status", "claims", ("status",))])
+    assert db.indexes == ["idx_claims_status"]
+    assert len(applied) == 1
+    index_name, deciding_query, speedup, query_costs = applied[0]
+    assert (index_name, deciding_query, speedup) == ("idx_claims_status", "pending claims", 10.0)
+    assert query_costs["heavy join"]["speedup"] == 1.0
+    assert len(db.log) == 1
+    assert db.log[0][:7] == ("idx_claims_status", "claims", "status", "pending claims", 100.0, 10.0, 10.0)
+    assert db.log[0][-1].adapted == query_costs
+
+
+def test_advise_rejects_index_with_small_absolute_saving():
+    # 10x faster, but "lookup" only saves 4.5 cost units: not worth the write cost.
+    db = FakeDatabase(query_costs=COSTS, index_effects={"idx_food_location": {"SELECT lookup": 0.5}})
+    assert migrations.advise_indexes(db, WORKLOAD, [("idx_food_location", "food", ("location",))]) == []
+    assert db.indexes == []
+
+
+def test_advise_rolls_back_rejected_index():
+    db = FakeDatabase(query_costs=COSTS, index_effects={"idx_food_location": {"SELECT heavy": 950.0}})
+    applied = migrations.advise_indexes(db, WORKLOAD, [("idx_food_location", "food", ("location",))])
+    assert applied == []
+    assert db.indexes == []
+    assert db.log == []
+    assert db.rollbacks > 0
+
+
+def test_advise_skips_unplannable_queries():
+    workload = WORKLOAD + [("broken", "SELECT broken", None)]
+    db = FakeDatabase(query_costs=COSTS, index_effects={"idx_claims_status": {"SELECT pending": 10.0}},
+                      unplannable=["SELECT broken"])
+    applied = migrations.advise_indexes(db, workload, [("idx_claims_status", "claims", ("status",))])
+    assert db.indexes == ["idx_claims_status"]
+    assert set(applied[0][3]) == {"heavy join", "pending claims", "lookup"}
+
+
+def test_advise_skips_existing_candidates():
+    existing = [
+        ("claims", "hand_made_status_idx", ["status", "food_id"]),
+        ("food", "idx_food_location", ["location"]),
+    ]
+    effects = {
+        "idx_claims_status": {"SELECT pending": 10.0},
+        "idx_food_location": {"SELECT heavy": 1.0},
+    }
+    db = FakeDatabase(query_costs=COSTS, index_effects=effects, existing_indexes=existing)
+    candidates = [
+        ("idx_claims_status", "claims", ("status",)),
+        ("idx_food_location", "food", ("location",)),
+    ]
+    assert migrations.advise_indexes(db, WORKLOAD, candidates) == []
+    assert not any(isinstance(query, sql.Composed) and "CREATE INDEX" in query.seq[0].string
+                   for query in db.executed)
+
+
+def test_advise_skips_candidate_covered_by_applied_index():
+    effects = {
+        "idx_claims_status_food_id": {"SELECT pending": 10.0},
+        "idx_claims_status": {"SELECT pending": 10.0},
+    }
+    db = FakeDatabase(query_costs=COSTS, index_effects=effects)
+    candidates = [
+        ("idx_claims_status_food_id", "claims", ("status", "food_id")),
+        ("idx_claims_status", "claims", ("status",)),
+    ]
+    applied = migrations.advise_indexes(db, WORKLOAD, candidates)
+    assert [entry[0] for entry in applied] == ["idx_claims_status_food_id"]
+    assert db.indexes == ["idx_claims_status_food_id"]
+
+
+def test_advise_refuses_outdated_schema():
+    db = FakeDatabase(schema_version=LATEST_VERSION - 1, query_costs=COSTS,
+                      index_effects={"idx_claims_status": {"SELECT pending": 10.0}})
+    assert migrations.advise_indexes(db, WORKLOAD, [("idx_claims_status", "claims", ("status",))]) is None
+    assert db.indexes == []
+    assert not any(isinstance(query, sql.Composed) for query in db.executed)
+
+
+def test_advise_refuses_empty_tables():
+    db = FakeDatabase(query_costs=COSTS, index_effects={"idx_claims_status": {"SELECT pending": 10.0}},
+                      empty_tables=["claims"])
+    assert migrations.advise_indexes(db, WORKLOAD, [("idx_claims_status", "claims", ("status",))]) is None
+    assert db.indexes == []
+    assert not any(isinstance(query, str) and query.startswith("EXPLAIN") for query in db.executed)